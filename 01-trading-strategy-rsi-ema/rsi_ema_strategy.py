@@ -5,8 +5,11 @@
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
-import yfinance as yf
-import pandas_ta as ta
+import talib
+from numba import njit
+
+from quant_common.indicators import ema_nb
+from quant_common.market_data import fetch
 
 # -------------------------------
 # 1. Download data
@@ -14,28 +17,29 @@ import pandas_ta as ta
 TICKER = "GOLDBEES.NS"
 START = "2024-01-01"
 END   = "2025-12-04"
+INTERVAL = "1d"
+RSI_BUY_LEVEL = 55  # RSI must be above this to confirm momentum
 
-stock = yf.download(TICKER, start=START, end=END)
+stock = fetch([TICKER], interval=INTERVAL, start=START, end=END).get(TICKER)
 
-if stock.empty:
+if stock is None:
     raise SystemExit("No data downloaded. Check ticker or date range.")
 
-# If yfinance returns MultiIndex columns (sometimes happens), flatten them
-if isinstance(stock.columns, pd.MultiIndex):
-    stock.columns = stock.columns.droplevel(1)
-
-# Keep only needed columns
-stock = stock[["Open", "High", "Low", "Close", "Volume"]].dropna()
-
 # -------------------------------
 # 2. Indicators (RSI + EMAs)
 # -------------------------------
-stock["RSI"] = ta.rsi(stock["Close"], length=14)
-stock["EMA_20"] = ta.ema(stock["Close"], length=20)
-stock["EMA_50"] = ta.ema(stock["Close"], length=50)
+close_arr = stock["Close"].to_numpy(dtype=np.float64)
+rsi_arr = talib.RSI(close_arr, timeperiod=14)
+ema20_arr = ema_nb(close_arr, 20)
+ema50_arr = ema_nb(close_arr, 50)
+
+stock["RSI"] = rsi_arr
+stock["EMA_20"] = ema20_arr
+stock["EMA_50"] = ema50_arr
 
 # Drop rows where indicators are not ready
-stock = stock.dropna(subset=["RSI", "EMA_20", "EMA_50"]).copy()
+valid = ~np.isnan(rsi_arr) & ~np.isnan(ema20_arr) & ~np.isnan(ema50_arr)
+stock = stock[valid].copy()
 
 if stock.empty:
     raise SystemExit("No data left after indicators. Try older START date.")
@@ -45,64 +49,66 @@ if stock.empty:
 # -------------------------------
 # Buy when:
 #  - EMA_20 > EMA_50 (uptrend)
-#  - RSI > 55 (momentum confirmation)
-stock["BUYSIGNAL"] = (stock["EMA_20"] > stock["EMA_50"]) & (stock["RSI"] > 55)
+#  - RSI > RSI_BUY_LEVEL (momentum confirmation)
+ema20 = stock["EMA_20"].to_numpy(np.float64)
+ema50 = stock["EMA_50"].to_numpy(np.float64)
+rsi = stock["RSI"].to_numpy(np.float64)
+
+# Both conditions on the raw arrays, combined into one bool array
+stock["BUYSIGNAL"] = np.logical_and(ema20 > ema50, rsi > RSI_BUY_LEVEL, dtype=bool)
 
 # -------------------------------
-# 4. ENTRY / EXIT LOGIC
+# 4. ENTRY / EXIT LOGIC (NUMBA BACKTEST)
 # -------------------------------
-# ENTRY: BUYSIGNAL turns from False -> True
-# EXIT : BUYSIGNAL turns from True  -> False
-stock["ENTRY"] = (stock["BUYSIGNAL"].shift(1) == False) & (stock["BUYSIGNAL"] == True)
-stock["EXIT"]  = (stock["BUYSIGNAL"].shift(1) == True) & (stock["BUYSIGNAL"] == False)
+# Entry: BUYSIGNAL turns from False -> True
+# Exit : BUYSIGNAL turns from True  -> False
+@njit(cache=True)
+def backtest(sig):
+    """Walk the buy signal once and return (entry_idx, exit_idx) arrays of trade bars.
+
+    A trade opens on a rising edge of `sig` (False -> True) and closes on the
+    next falling edge (True -> False); a trade still open at the end is closed
+    at the last bar. The first bar is never an edge (it has no previous bar).
+    Per-bar exit rules such as stops belong in this loop.
+    """
+    n = sig.size
+    entry_out = np.empty(n, dtype=np.int64)
+    exit_out = np.empty(n, dtype=np.int64)
+    n_trades = 0
+    in_trade = False
+
+    for i in range(1, n):
+        if (not in_trade) and sig[i] and not sig[i - 1]:
+            entry_out[n_trades] = i
+            in_trade = True
+        elif in_trade and not sig[i]:
+            exit_out[n_trades] = i
+            n_trades += 1
+            in_trade = False
+
+    # If last trade is still open at the end, close it at the last bar
+    if in_trade:
+        exit_out[n_trades] = n - 1
+        n_trades += 1
+
+    return entry_out[:n_trades], exit_out[:n_trades]
+
 
 # -------------------------------
-# 5. BUILD TRADES TABLE USING A LOOP
+# 5. BUILD TRADES TABLE
 # -------------------------------
-trades_list = []
-in_trade = False
-entry_price = None
-entry_date = None
-
-for date, row in stock.iterrows():
-    if (not in_trade) and row["ENTRY"]:
-        # Open trade
-        in_trade = True
-        entry_date = date
-        entry_price = row["Close"]
-
-    elif in_trade and row["EXIT"]:
-        # Close trade
-        exit_date = date
-        exit_price = row["Close"]
-        trade_return = (exit_price - entry_price) / entry_price * 100
-
-        trades_list.append({
-            "EntryDate": entry_date,
-            "ExitDate": exit_date,
-            "EntryPrice": entry_price,
-            "ExitPrice": exit_price,
-            "RETURN%": trade_return
-        })
-
-        in_trade = False
-        entry_price = None
-        entry_date = None
-
-# If last trade is still open at the end, close it at last available close price
-if in_trade:
-    exit_date = stock.index[-1]
-    exit_price = stock["Close"].iloc[-1]
-    trade_return = (exit_price - entry_price) / entry_price * 100
-    trades_list.append({
-        "EntryDate": entry_date,
-        "ExitDate": exit_date,
-        "EntryPrice": entry_price,
-        "ExitPrice": exit_price,
-        "RETURN%": trade_return
-    })
-
-trades = pd.DataFrame(trades_list)
+entry_idx, exit_idx = backtest(stock["BUYSIGNAL"].to_numpy())
+
+close = stock["Close"].to_numpy()
+dates = stock.index.to_numpy()
+
+trades = pd.DataFrame({
+    "EntryDate": dates[entry_idx],
+    "ExitDate": dates[exit_idx],
+    "EntryPrice": close[entry_idx],
+    "ExitPrice": close[exit_idx],
+    "RETURN%": (close[exit_idx] / close[entry_idx] - 1) * 100
+})
 
 # -------------------------------
 # 6. PRINT TRADES & STATS
@@ -142,7 +148,7 @@ plt.subplot(2, 1, 2)
 plt.plot(stock.index, stock["RSI"], label="RSI (14)", color="blue")
 plt.axhline(30, linestyle="--", color="green", alpha=0.7)
 plt.axhline(70, linestyle="--", color="red", alpha=0.7)
-plt.axhline(55, linestyle="--", color="purple", alpha=0.7, label="Buy Level 55")
+plt.axhline(RSI_BUY_LEVEL, linestyle="--", color="purple", alpha=0.7, label=f"Buy Level {RSI_BUY_LEVEL}")
 plt.title("RSI Indicator")
 plt.ylabel("RSI")
 plt.xlabel("Date")
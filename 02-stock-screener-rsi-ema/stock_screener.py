@@ -2,9 +2,14 @@
 # IMPROVED STOCK SCREENER (RSI + EMA)
 # ================================
 
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
 import pandas as pd
-import yfinance as yf
-import pandas_ta as ta
+import talib
+
+from quant_common.indicators import ema_nb
+from quant_common.market_data import fetch
 
 # --- Tickers to Scan ---
 TICKERS = [
@@ -16,43 +21,40 @@ TICKERS = [
 PERIOD = "200d"
 INTERVAL = "1d"
 
-results = []
+print(f"Downloading {len(TICKERS)} tickers ...")
+# The screen only needs Close, so only that column is loaded
+frames = fetch(TICKERS, interval=INTERVAL, columns=["Close"], period=PERIOD)
 
-for ticker in TICKERS:
-    print(f"Processing {ticker} ...")
+# One float64 Close array per ticker
+close_map = {}
 
-    try:
-        data = yf.download(
-            ticker,
-            period=PERIOD,
-            interval=INTERVAL,
-            progress=False,
-            threads=True
-        )
+for ticker in TICKERS:
+    if ticker not in frames:
+        print(f"  -> No data for {ticker}, skipping.\n")
+        continue
 
-        if data.empty:
-            print(f"  -> No data for {ticker}, skipping.\n")
-            continue
+    close_map[ticker] = frames[ticker]["Close"].to_numpy(np.float64)
 
-        # Fix MultiIndex issue
-        if isinstance(data.columns, pd.MultiIndex):
-            data.columns = data.columns.droplevel(1)
 
-        data = data[["Open", "High", "Low", "Close", "Volume"]].dropna()
+def screen_one(ticker, close_arr):
+    """Screen one ticker's Close array and return (row, message).
 
+    Exactly one of the two is None. Nothing is printed here because this runs
+    on worker threads; the caller prints the messages in ticker order.
+    """
+    try:
         # Indicators
-        data["EMA_20"] = ta.ema(data["Close"], length=20)
-        data["EMA_50"] = ta.ema(data["Close"], length=50)
-        data["RSI_14"] = ta.rsi(data["Close"], length=14)
+        ema20_arr = ema_nb(close_arr, 20)
+        ema50_arr = ema_nb(close_arr, 50)
+        rsi14_arr = talib.RSI(close_arr, timeperiod=14)
 
-        data = data.dropna()
+        close = close_arr[-1]
+        ema20 = ema20_arr[-1]
+        ema50 = ema50_arr[-1]
+        rsi14 = rsi14_arr[-1]
 
-        last = data.iloc[-1]
-
-        close = last["Close"]
-        ema20 = last["EMA_20"]
-        ema50 = last["EMA_50"]
-        rsi14 = last["RSI_14"]
+        if np.isnan(ema50) or np.isnan(rsi14):
+            return None, f"Not enough data for {ticker}, skipping."
 
         # Screener conditions
         uptrend = ema20 > ema50
@@ -63,7 +65,7 @@ for ticker in TICKERS:
 
         passes_screen = uptrend and price_above_ema20 and rsi_ok
 
-        results.append({
+        return {
             "Ticker": ticker,
             "Close": round(close, 2),
             "EMA_20": round(ema20, 2),
@@ -73,12 +75,28 @@ for ticker in TICKERS:
             "Price > EMA20": price_above_ema20,
             "RSI Between 50–70": rsi_ok,
             "PASS_SCREEN": passes_screen
-        })
+        }, None
 
     except Exception as e:
-        print(f"  -> Error for {ticker}: {e}\n")
+        return None, f"Error for {ticker}: {e}"
+
+
+# Threads only overlap where the indicator code releases the GIL: ema_nb is
+# compiled nogil, TA-Lib may not be, and short series gain little either way.
+with ThreadPoolExecutor(max_workers=max(1, min(16, len(close_map)))) as ex:
+    outcomes = list(ex.map(lambda kv: screen_one(*kv), close_map.items()))
+
+results = []
+
+for ticker, (row, message) in zip(close_map, outcomes):
+    print(f"Processing {ticker} ...")
+
+    if row is None:
+        print(f"  -> {message}\n")
         continue
 
+    results.append(row)
+
 # Convert to DataFrame
 results_df = pd.DataFrame(results)
 
@@ -2,12 +2,15 @@
 # PORTFOLIO RISK & RETURN DASHBOARD
 # =======================================
 
-import yfinance as yf
+import argparse
+
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 
+from quant_common.market_data import fetch
+
 # -------------------------------
 # 1. PARAMETERS
 # -------------------------------
@@ -28,50 +31,40 @@ PERIOD = "1y"        # last 1 year
 INTERVAL = "1d"      # daily data
 RISK_FREE_RATE = 0.0 # annual RF
 
+parser = argparse.ArgumentParser(description="Portfolio risk & return dashboard")
+parser.add_argument("--csv", action="store_true",
+                    help="also save results as CSV for manual inspection")
+# parse_known_args ignores the extra "-f kernel.json" argument when run in Jupyter
+args = parser.parse_known_args()[0]
+
 # -------------------------------
 # 2. DOWNLOAD DATA
 # -------------------------------
-prices = {}
+print(f"Downloading {len(TICKERS)} tickers ...")
+try:
+    frames = fetch(TICKERS, interval=INTERVAL, columns=["Close"], period=PERIOD)
+except Exception as e:
+    print(f"  -> ERROR while downloading: {e}")
+    frames = {}
 
-for ticker in TICKERS:
-    print(f"Downloading {ticker} ...")
-    try:
-        data = yf.download(
-            ticker,
-            period=PERIOD,
-            interval=INTERVAL,
-            progress=False
-        )
-    except Exception as e:
-        print(f"  -> ERROR while downloading {ticker}: {e}")
-        continue
+series_list = []
+kept = []
 
-    if data is None or data.empty:
+for ticker in TICKERS:
+    if ticker not in frames:
         print(f"  -> No data returned for {ticker}.")
         continue
 
-    # Sometimes yfinance returns MultiIndex columns, handle it just in case
-    if isinstance(data.columns, pd.MultiIndex):
-        data.columns = data.columns.droplevel(1)
-
-    if "Close" not in data.columns:
-        print(f"  -> 'Close' column missing for {ticker}, columns are: {data.columns}")
-        continue
-
-    close_series = data["Close"].dropna()
-
-    if close_series.empty:
-        print(f"  -> Close price is empty for {ticker}.")
-        continue
-
+    close_series = frames[ticker]["Close"]
     print(f"  -> Downloaded {len(close_series)} rows for {ticker}.")
-    prices[ticker] = close_series
+    series_list.append(close_series)
+    kept.append(ticker)
 
-print("\nFinished download loop.")
-print("Tickers with data:", list(prices.keys()))
+print("\nFinished download.")
+print("Tickers with data:", kept)
 
 # If nothing got downloaded, stop gracefully
-if not prices:
+if not kept:
     print("\n❌ No data downloaded for ANY ticker.")
     print("Possible reasons:")
     print("  - No internet connection / blocked access")
@@ -82,8 +75,11 @@ if not prices:
 # -------------------------------
 # 3. BUILD PRICE DATAFRAME
 # -------------------------------
-price_df = pd.DataFrame(prices)
-price_df = price_df.dropna(how="all")
+# One outer join over all date indexes
+price_df = pd.concat(series_list, axis=1, keys=kept, join="outer").dropna(how="all")
+
+# float32 halves the buffers behind returns, equity curves, hist and corr input
+price_df = price_df.astype(np.float32)
 
 print("\nFirst few rows of price data:")
 print(price_df.head())
@@ -100,38 +96,37 @@ print("returns_df shape:", returns_df.shape)
 # -------------------------------
 # 5. PERFORMANCE METRICS PER STOCK
 # -------------------------------
-summary_rows = []
 trading_days = 252
 daily_rf = (1 + RISK_FREE_RATE) ** (1 / trading_days) - 1
 
-for ticker in returns_df.columns:
-    ret_series = returns_df[ticker].dropna()
-
-    if ret_series.empty:
-        print(f"  -> No return data for {ticker}, skipping metrics.")
-        continue
-
-    cumulative_return = (1 + ret_series).prod() - 1
-    avg_daily_ret = ret_series.mean()
-    annual_return = (1 + avg_daily_ret) ** trading_days - 1
-
-    daily_vol = ret_series.std()
-    annual_vol = daily_vol * np.sqrt(trading_days)
-
-    sharpe = np.nan
-    if daily_vol != 0:
-        excess_daily_ret = avg_daily_ret - daily_rf
-        sharpe = (excess_daily_ret / daily_vol) * np.sqrt(trading_days)
-
-    summary_rows.append({
-        "Ticker": ticker,
-        "CumulativeReturn_%": round(cumulative_return * 100, 2),
-        "AnnualReturn_%": round(annual_return * 100, 2),
-        "AnnualVol_%": round(annual_vol * 100, 2),
-        "Sharpe": round(sharpe, 2),
-    })
-
-summary_df = pd.DataFrame.from_records(summary_rows)
+# Tickers without any return data have nothing to summarise
+empty_cols = returns_df.columns[returns_df.isna().all()]
+for ticker in empty_cols:
+    print(f"  -> No return data for {ticker}, skipping metrics.")
+# Upcast so the mean/std/sum reductions accumulate in float64
+metric_returns = returns_df.drop(columns=empty_cols).astype(np.float64)
+
+# Column-wise reductions over the whole frame (NaNs are skipped per column)
+avg_daily_ret = metric_returns.mean()
+daily_vol = metric_returns.std()
+
+# Compound in log space: sum of log1p instead of a product of (1 + r)
+cumulative_return = np.expm1(np.log1p(metric_returns).sum())
+annual_return = (1 + avg_daily_ret) ** trading_days - 1
+annual_vol = daily_vol * np.sqrt(trading_days)
+sharpe = np.where(
+    daily_vol != 0,
+    (avg_daily_ret - daily_rf) / daily_vol * np.sqrt(trading_days),
+    np.nan
+)
+
+summary_df = pd.DataFrame({
+    "Ticker": metric_returns.columns,
+    "CumulativeReturn_%": (cumulative_return * 100).to_numpy(),
+    "AnnualReturn_%": (annual_return * 100).to_numpy(),
+    "AnnualVol_%": (annual_vol * 100).to_numpy(),
+    "Sharpe": sharpe,
+}).round(2)
 
 print("\n===== PORTFOLIO SUMMARY (PER STOCK) =====\n")
 print(summary_df)
@@ -139,26 +134,28 @@ print(summary_df)
 # -------------------------------
 # 6. EQUITY CURVES
 # -------------------------------
-equity_df = (1 + returns_df.fillna(0)).cumprod()
+equity_df = np.exp(np.log1p(returns_df.fillna(0)).cumsum())
 
-plt.figure(figsize=(12, 6))
-for ticker in equity_df.columns:
-    plt.plot(equity_df.index, equity_df[ticker], label=ticker)
-
-plt.title("Equity Curves (Starting at 1.0)")
-plt.xlabel("Date")
-plt.ylabel("Growth of 1 unit")
-plt.legend()
-plt.grid(True)
+ax = equity_df.plot(figsize=(12, 6), grid=True)
+ax.set_title("Equity Curves (Starting at 1.0)")
+ax.set_xlabel("Date")
+ax.set_ylabel("Growth of 1 unit")
 plt.tight_layout()
 plt.show()
 
 # -------------------------------
 # 7. DISTRIBUTION OF DAILY RETURNS
 # -------------------------------
+# Complete rows only, materialised once and shared by the histogram and the
+# correlation matrix below; tickers with no returns at all are left out so
+# they cannot empty every row
+clean_df = returns_df.drop(columns=empty_cols).dropna()
+clean_arr = clean_df.to_numpy()
+
+# One hist call for all tickers (each column is a dataset), overlaid as before
 plt.figure(figsize=(12, 6))
-for ticker in returns_df.columns:
-    plt.hist(returns_df[ticker].dropna(), bins=50, alpha=0.4, label=ticker)
+plt.hist(clean_arr, bins=50, alpha=0.4, histtype="stepfilled",
+         label=list(clean_df.columns), stacked=False)
 
 plt.title("Distribution of Daily Returns")
 plt.xlabel("Daily Return")
@@ -170,7 +167,9 @@ plt.show()
 # -------------------------------
 # 8. CORRELATION HEATMAP
 # -------------------------------
-corr_matrix = returns_df.corr()
+# Full correlation matrix in one BLAS pass over the complete rows
+corr_arr = np.corrcoef(clean_arr, rowvar=False)
+corr_matrix = pd.DataFrame(corr_arr, index=clean_df.columns, columns=clean_df.columns)
 
 plt.figure(figsize=(10, 8))
 sns.heatmap(corr_matrix, annot=True, fmt=".2f", cmap="coolwarm")
@@ -181,8 +180,15 @@ plt.show()
 # -------------------------------
 # 9. SAVE RESULTS
 # -------------------------------
-summary_df.to_csv("portfolio_summary.csv", index=False)
-returns_df.to_csv("daily_returns.csv")
-equity_df.to_csv("equity_curves.csv")
+summary_df.to_parquet("portfolio_summary.parquet", index=False, compression="zstd")
+returns_df.to_parquet("daily_returns.parquet", compression="zstd")
+equity_df.to_parquet("equity_curves.parquet", compression="zstd")
+
+print("\nSummary, returns, and equity curves saved as Parquet files.")
+
+if args.csv:
+    summary_df.to_csv("portfolio_summary.csv", index=False)
+    returns_df.to_csv("daily_returns.csv")
+    equity_df.to_csv("equity_curves.csv")
 
-print("\nSummary, returns, and equity curves saved as CSV files.")
+    print("Also saved as CSV files.")
@@ -0,0 +1 @@
+"""Helpers shared by the project scripts: cached market data and indicators."""
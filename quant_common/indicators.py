@@ -0,0 +1,20 @@
+# =======================================
+# INDICATORS (NUMBA)
+# =======================================
+
+import numpy as np
+from numba import njit
+
+
+@njit(cache=True, fastmath=True, nogil=True)
+def ema_nb(x, length):
+    """Recursive EMA seeded with the SMA of the first `length` values (same as talib.EMA)."""
+    out = np.full(x.size, np.nan)
+    if x.size < length:
+        return out
+
+    a = 2.0 / (length + 1)
+    out[length - 1] = x[:length].mean()
+    for i in range(length, x.size):
+        out[i] = a * x[i] + (1 - a) * out[i - 1]
+    return out
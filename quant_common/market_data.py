@@ -0,0 +1,84 @@
+# =======================================
+# CACHED MARKET DATA (YFINANCE + PARQUET)
+# =======================================
+
+import os
+import time
+from pathlib import Path
+
+import pandas as pd
+import yfinance as yf
+
+# Downloads are cached as Parquet (one file per ticker) and reused for a day
+CACHE_DIR = Path(".cache")
+CACHE_MAX_AGE = 24 * 60 * 60  # seconds
+OHLCV = ["Open", "High", "Low", "Close", "Volume"]
+
+
+def fetch(tickers, interval="1d", columns=OHLCV, start=None, end=None, period=None):
+    """Return {ticker: frame of `columns`} with NaN rows dropped.
+
+    Pass either `start`/`end` or `period`, as for yf.download. Tickers with a
+    Parquet cache file younger than CACHE_MAX_AGE are read from disk; the rest
+    are downloaded in one batched request. The cache always stores full OHLCV,
+    but only `columns` are read back.
+    Tickers with no usable data are left out of the result.
+    """
+    window = {"start": start, "end": end, "period": period}
+    window = {key: value for key, value in window.items() if value is not None}
+
+    frames = {}
+    missing = []
+
+    for ticker in tickers:
+        cache_path = _cache_path(ticker, window, interval)
+        if cache_path.exists() and time.time() - cache_path.stat().st_mtime < CACHE_MAX_AGE:
+            try:
+                frames[ticker] = pd.read_parquet(cache_path, columns=columns, engine="pyarrow")
+                continue
+            except Exception as e:
+                # Unreadable cache file (e.g. from an interrupted run): download again
+                print(f"  -> Ignoring unreadable cache file {cache_path}: {e}")
+
+        missing.append(ticker)
+
+    if missing:
+        # One batched request for all uncached tickers. multi_level_index=True
+        # (yfinance >= 0.2.48) keeps (Ticker, Price) columns even when only
+        # one ticker is downloaded.
+        raw = yf.download(
+            missing,
+            interval=interval,
+            group_by="ticker",
+            multi_level_index=True,
+            threads=True,
+            progress=False,
+            **window
+        )
+
+        for ticker in missing:
+            if ticker not in raw.columns.get_level_values(0):
+                continue
+
+            data = raw[ticker][OHLCV].dropna(how="all")
+            if data.empty:
+                continue
+
+            # Write to a temp file first so an interrupted run never leaves a
+            # partial file at the final path
+            cache_path = _cache_path(ticker, window, interval)
+            tmp_path = cache_path.with_suffix(".parquet.tmp")
+            CACHE_DIR.mkdir(exist_ok=True)
+            data.to_parquet(tmp_path, engine="pyarrow", compression="zstd")
+            os.replace(tmp_path, cache_path)
+            frames[ticker] = data
+
+    # Select and clean every frame in one place
+    frames = {ticker: data.loc[:, columns].dropna() for ticker, data in frames.items()}
+    return {ticker: data for ticker, data in frames.items() if not data.empty}
+
+
+def _cache_path(ticker, window, interval):
+    """Cache file for one ticker, e.g. .cache/TCS.NS_1y_1d.parquet."""
+    parts = [ticker, *window.values(), interval]
+    return CACHE_DIR / ("_".join(str(part) for part in parts) + ".parquet")